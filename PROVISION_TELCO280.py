@@ -14,17 +14,20 @@ from configure_core_mgmt_ip import get_intermediate_port_description
 from configure_core_mgmt_ip import get_new_port_description
 from configure_core_mgmt_ip import configure_core_interface_description_and_show_run_interface
 from send_email import send_completed_email
+from validate_config_parameters import preflight_config_parameters
+from setup_logging import setup_logging
+from setup_logging import log_artifact
 import secrets
 
-logging.basicConfig(
-    filename='files/log.txt',
-    level=logging.DEBUG,
-    format="%(asctime)s %(message)s"
-)
+job_id = setup_logging()
 
 with open(f'{secrets.path_to_config_parameters_file}/CONFIG_PARAMETERS.json', 'r') as config_parameters_file:
     config_parameters = json.load(config_parameters_file)
-    logging.info(f'Running for config_parameters: {config_parameters}')
+    #The config parameters are not validated yet, so the message must not read from them
+    log_artifact('config_parameters.json', config_parameters, f'Running job {job_id}')
+
+#Validate the config parameters before making any changes, so bad input does not leave the Telco half-configured
+preflight_config_parameters(config_parameters)
 
 #Get Mgmt IP from inventory number
 logging.info(f'Looking up mgmt IP for inventory number {config_parameters["INVENTORY_NUMBER"]}')
@@ -108,8 +111,9 @@ except:
 logging.info(f'Getting CAM table for VLAN 254...')
 child.sendline('show mac-address-table vlan 254 dynamic')
 child.expect(f'{hostname}#', 10)
-output = child.before.decode().split()
-logging.info(f'CAM table output: {output}')
+cam_table_output = child.before.decode()
+log_artifact('cam_table.txt', cam_table_output, 'Got CAM table output')
+output = cam_table_output.split()
 
 if '1/1/1' in output:
     config_parameters['UPLINK'] = '1/1/1'
@@ -129,7 +133,7 @@ else:
 #Generate config
 logging.info('Generating config...')
 config = generate_280_config(config_parameters)
-logging.info(f'Generated config: {config}')
+log_artifact('config.txt', config, 'Generated config')
 
 #Apply config
 new_hostname = config_parameters["HOSTNAME"]
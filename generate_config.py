@@ -1,6 +1,9 @@
 from jinja2 import Template
 import sys
 import logging
+from setup_logging import log_artifact
+from telco280_constants import SERVICE_TYPE_TO_VLAN_ID
+from telco280_constants import TELCO280_INTERFACES
 
 def generate_280_config(config_parameters):
     """
@@ -8,17 +11,8 @@ def generate_280_config(config_parameters):
     with SNMP, AAA, banner, etc, is already there from being inventoried. This only configures the interfaces,
     VLANs, TLS and SNMP location. The SNMP location was found by obtaining the router's SNMP location.
     """
-    service_type_to_vlan_id = {
-        'DIA': '10',
-        'MPLS': '20',
-        'SIP': '30',
-        'EPL': '40',
-        'EVPL': '40',
-        'VPLS': '40'
-    }
-
     #Initiliaze list of unused interfaces with all interfaces on the Telco 280
-    unused_interfaces = ['1/1/1', '1/2/1', '1/2/2', '1/3/1']
+    unused_interfaces = list(TELCO280_INTERFACES)
 
     unused_interfaces.remove(config_parameters['UPLINK'])
 
@@ -35,7 +29,7 @@ def generate_280_config(config_parameters):
 
         all_upload_bandwidth_values.append(int(service['UPLOAD_BANDWIDTH']))
 
-        service['VLAN'] = service_type_to_vlan_id[service['TYPE']]
+        service['VLAN'] = SERVICE_TYPE_TO_VLAN_ID[service['TYPE']]
         unused_interfaces.remove(service['LAN_INTERFACE'])
 
     config_parameters['UNUSED_INTERFACES'] = unused_interfaces
@@ -62,7 +56,7 @@ def generate_280_config(config_parameters):
         telco280_template = Template(telco280_template.read())
 
     #Render j2 template with the config parameters
-    logging.info(f'Config parameters prior to rendering template: {config_parameters}')
+    log_artifact('config_parameters_rendered.json', config_parameters, 'Config parameters prior to rendering template')
     telco280_config = telco280_template.render(config_parameters)
     
     #Return the config with no blank lines
@@ -0,0 +1,216 @@
+import os
+import sys
+import gzip
+import fcntl
+import json
+import queue
+import atexit
+import shutil
+import logging
+import logging.handlers
+from uuid import uuid4
+from datetime import datetime, timezone
+
+#Every job (one run of the script) gets its own directory, with its log and artifacts, i.e.
+# files/jobs/<job_id>/log.jsonl and files/jobs/<job_id>/artifacts/config.txt
+#Jobs run as separate processes, so no log file is ever shared or rotated by more than one process.
+JOB_DIRECTORY = 'files/jobs'
+LOG_FILE_NAME = 'log.jsonl'
+
+#A running job holds an exclusive lock on this file until its process exits, so it is never pruned
+JOB_LOCK_FILE_NAME = 'job.lock'
+ARTIFACT_DIRECTORY_NAME = 'artifacts'
+
+#Rotate a job's log once it reaches 1 MB, and keep 5 compressed old segments
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+#Number of most recent jobs to keep logs and artifacts for
+JOBS_TO_KEEP = 50
+
+_job_id = None
+_listener = None
+_job_lock_file = None
+
+
+class JobIdFilter(logging.Filter):
+    """
+    Adds the job ID to every log record, so log lines from concurrent jobs can be told apart.
+    """
+    def filter(self, record):
+        record.job_id = _job_id
+        return True
+
+
+class ArtifactHandler(logging.Handler):
+    """
+    Writes large payloads (configs, CAM tables, etc) attached to a log record to their own file in the
+    job's artifact directory, and replaces the payload on the record with the path to that file.
+    This runs on the background listener thread, so the disk I/O is off the provisioning path.
+    """
+    def emit(self, record):
+        artifact = getattr(record, 'artifact', None)
+        if artifact is None:
+            return
+
+        try:
+            artifact_directory = os.path.join(JOB_DIRECTORY, record.job_id, ARTIFACT_DIRECTORY_NAME)
+            os.makedirs(artifact_directory, exist_ok=True)
+            artifact_path = os.path.join(artifact_directory, artifact['name'])
+            with open(artifact_path, 'w') as artifact_file:
+                artifact_file.write(artifact['content'])
+            record.artifact_path = artifact_path
+        except Exception:
+            self.handleError(record)
+        finally:
+            #Do not let the payload reach the log file, even if writing the artifact failed
+            record.artifact = None
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats log records as compact, single line JSON.
+    """
+    def format(self, record):
+        log_entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'job': getattr(record, 'job_id', None),
+            'module': record.module,
+            'message': record.getMessage()
+        }
+
+        artifact_path = getattr(record, 'artifact_path', None)
+        if artifact_path is not None:
+            log_entry['artifact'] = artifact_path
+
+        return json.dumps(log_entry, separators=(',', ':'), default=str)
+
+
+def compress_rotated_log(source, dest):
+    """
+    Rotator for the RotatingFileHandler which gzips the old log segment instead of renaming it.
+    """
+    with open(source, 'rb') as source_file, gzip.open(dest, 'wb') as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+    os.remove(source)
+
+
+def get_job_last_modified(job_directory):
+    """
+    Returns the last time a job wrote to its log, or the modification time of the job directory if it has no log.
+    Writing to the log does not change the directory's modification time, so the log is checked first.
+    """
+    try:
+        return os.path.getmtime(os.path.join(job_directory, LOG_FILE_NAME))
+    except OSError:
+        return os.path.getmtime(job_directory)
+
+
+def lock_job(job_directory):
+    """
+    Takes an exclusive lock on the job's lock file without waiting, and returns the open lock file.
+    Returns None if another process holds the lock, meaning that job is still running.
+    The lock is released when the file is closed, or by the OS when the process exits.
+    """
+    lock_file = open(os.path.join(job_directory, JOB_LOCK_FILE_NAME), 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+
+    return lock_file
+
+
+def prune_old_jobs(current_job_id):
+    """
+    Deletes the logs and artifacts of all but the most recently active jobs, so they do not grow without limit.
+    Job IDs may be given by the caller, so jobs are sorted by when they were last modified rather than by name.
+    Jobs which are still running hold their lock, and are skipped even if they have been idle for a long time.
+    """
+    job_directories = []
+    for job_id in os.listdir(JOB_DIRECTORY):
+        job_directory = os.path.join(JOB_DIRECTORY, job_id)
+        if job_id == current_job_id or not os.path.isdir(job_directory):
+            continue
+        try:
+            job_directories.append((get_job_last_modified(job_directory), job_directory))
+        except OSError:
+            #Another job pruned it first
+            continue
+
+    job_directories.sort()
+    #Keep room for the current job within JOBS_TO_KEEP
+    for _, job_directory in job_directories[:max(len(job_directories) - (JOBS_TO_KEEP - 1), 0)]:
+        try:
+            lock_file = lock_job(job_directory)
+        except OSError:
+            #Another job pruned it first
+            continue
+
+        if lock_file is None:
+            continue
+
+        #Hold the job's lock while deleting it, so the job cannot be resumed under the same job ID meanwhile
+        with lock_file:
+            shutil.rmtree(job_directory, ignore_errors=True)
+
+
+def setup_logging(job_id=None):
+    """
+    Sets up logging for a provisioning job and returns the job ID.
+    Log calls only put the record on a queue. A background thread writes the records to the job's own log file
+    as compact JSON, rotating the file by size and compressing the old segments, and writes any artifacts
+    attached with log_artifact to their own files.
+    """
+    global _job_id, _listener, _job_lock_file
+
+    if _listener is not None:
+        return _job_id
+
+    _job_id = job_id or f'{datetime.now().strftime("%Y%m%d-%H%M%S")}-{uuid4().hex[:8]}'
+
+    job_directory = os.path.join(JOB_DIRECTORY, _job_id)
+    os.makedirs(job_directory, exist_ok=True)
+
+    #Hold this job's lock for the life of the process, so other jobs do not prune it while it runs
+    _job_lock_file = lock_job(job_directory)
+    if _job_lock_file is None:
+        print(f'Job {_job_id} is already running in another process. Exiting script.')
+        sys.exit(1)
+
+    prune_old_jobs(_job_id)
+
+    log_file = os.path.join(job_directory, LOG_FILE_NAME)
+    file_handler = logging.handlers.RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT)
+    file_handler.namer = lambda name: f'{name}.gz'
+    file_handler.rotator = compress_rotated_log
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(JobIdFilter())
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)
+    root_logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, ArtifactHandler(), file_handler)
+    _listener.start()
+
+    #Flush the queue on exit, including sys.exit() on failures
+    atexit.register(_listener.stop)
+
+    return _job_id
+
+
+def log_artifact(name, content, message):
+    """
+    Logs the message, and stores the content in a separate file for this job instead of inlining it in the log.
+    The log record references the artifact file. Dicts and lists are stored as JSON.
+    """
+    if not isinstance(content, str):
+        content = json.dumps(content, indent=2, default=str)
+
+    logging.info(message, extra={'artifact': {'name': name, 'content': content}}, stacklevel=2)
@@ -0,0 +1,15 @@
+#Service type to the VLAN ID that service is built on
+SERVICE_TYPE_TO_VLAN_ID = {
+    'DIA': '10',
+    'MPLS': '20',
+    'SIP': '30',
+    'EPL': '40',
+    'EVPL': '40',
+    'VPLS': '40'
+}
+
+#All interfaces on the Telco 280
+TELCO280_INTERFACES = ('1/1/1', '1/2/1', '1/2/2', '1/3/1')
+
+#The Telco 280 uplink is either 1/1/1 or 1/3/1, and is found from the CAM table at run time
+UPLINK_CANDIDATES = ('1/1/1', '1/3/1')
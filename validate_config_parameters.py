@@ -0,0 +1,206 @@
+import re
+import sys
+import json
+import logging
+from telco280_constants import SERVICE_TYPE_TO_VLAN_ID
+from telco280_constants import TELCO280_INTERFACES
+from telco280_constants import UPLINK_CANDIDATES
+
+#Top level keys required in CONFIG_PARAMETERS.json
+REQUIRED_PARAMETERS = ('INVENTORY_NUMBER', 'HOSTNAME', 'SERVICES')
+
+#Top level keys which must be strings
+STRING_PARAMETERS = ('HOSTNAME',)
+
+#Keys required on every service, all of which must be strings
+REQUIRED_SERVICE_PARAMETERS = ('TYPE', 'PON', 'LAN_INTERFACE')
+
+#Keys required on the first service, which are used to build the IPAM description
+REQUIRED_FIRST_SERVICE_PARAMETERS = ('COMPANY_NAME', 'STREET', 'CITY', 'STATE', 'ZIP_CODE')
+
+
+def compile_config_parameters_validator():
+    """
+    Builds the lookup tables for the CONFIG_PARAMETERS schema once, and returns a validator function.
+    The validator takes the config parameters and returns a list of every error found and a list of warnings.
+    The config parameters are valid if the list of errors is empty. It makes no network calls, so it can be run
+    before anything is touched, and it can be reused to validate many parameter files in a batch.
+
+    The uplink (1/1/1 or 1/3/1) is not known until the CAM table is read from the Telco, which happens after
+    IPAM, LibreNMS and the core router have been touched. Unless UPLINK is given in the config parameters, a
+    service using one of the uplink candidates as its LAN interface can only be reported as a warning. It is
+    only an error if the services use every uplink candidate, since then no uplink is possible.
+    """
+    valid_service_types = frozenset(SERVICE_TYPE_TO_VLAN_ID)
+    valid_interfaces = frozenset(TELCO280_INTERFACES)
+    uplink_candidates = tuple(UPLINK_CANDIDATES)
+    service_type_list = ', '.join(SERVICE_TYPE_TO_VLAN_ID)
+    interface_list = ', '.join(TELCO280_INTERFACES)
+    uplink_candidate_list = ' or '.join(UPLINK_CANDIDATES)
+
+    #Bandwidth values are rendered verbatim into the config, so strings must be only digits, i.e. '100'
+    digits_pattern = re.compile('[0-9]+')
+
+    def is_positive_integer(value):
+        if isinstance(value, bool):
+            return False
+        if isinstance(value, int):
+            return value > 0
+        if isinstance(value, str):
+            return digits_pattern.fullmatch(value) is not None and int(value) > 0
+        return False
+
+    def is_non_empty(value):
+        return value is not None and str(value).strip() != ''
+
+    def validate_service(index, service, errors):
+        name = f'Service {index + 1}'
+        if not isinstance(service, dict):
+            errors.append(f'{name} must be an object, got {type(service).__name__}.')
+            return None
+
+        for key in REQUIRED_SERVICE_PARAMETERS:
+            if not is_non_empty(service.get(key)):
+                errors.append(f'{name} is missing {key}.')
+            elif not isinstance(service[key], str):
+                errors.append(f'{name} has an invalid {key}: {service[key]!r}. It must be a string.')
+
+        if index == 0:
+            for key in REQUIRED_FIRST_SERVICE_PARAMETERS:
+                if not is_non_empty(service.get(key)):
+                    errors.append(f'{name} is missing {key}, which is needed for the IPAM description.')
+
+        service_type = service.get('TYPE')
+        if isinstance(service_type, str) and is_non_empty(service_type):
+            name = f'{name} ({service_type})'
+            if service_type not in valid_service_types:
+                errors.append(f'{name} has an unknown TYPE. Valid types are: {service_type_list}.')
+
+        #Either BANDWIDTH, or both DOWNLOAD_BANDWIDTH and UPLOAD_BANDWIDTH, must be given
+        if 'BANDWIDTH' in service:
+            if not is_positive_integer(service['BANDWIDTH']):
+                errors.append(f'{name} has an invalid BANDWIDTH: {service["BANDWIDTH"]!r}. It must be a whole number of Mbps.')
+        else:
+            for key in ('DOWNLOAD_BANDWIDTH', 'UPLOAD_BANDWIDTH'):
+                if key not in service:
+                    errors.append(f'{name} is missing {key} (or BANDWIDTH).')
+                elif not is_positive_integer(service[key]):
+                    errors.append(f'{name} has an invalid {key}: {service[key]!r}. It must be a whole number of Mbps.')
+
+        lan_interface = service.get('LAN_INTERFACE')
+        if isinstance(lan_interface, str) and is_non_empty(lan_interface):
+            if lan_interface not in valid_interfaces:
+                errors.append(f'{name} has an unknown LAN_INTERFACE {lan_interface}. Valid interfaces are: {interface_list}.')
+                return None
+            return lan_interface
+
+        return None
+
+    def validate(config_parameters):
+        errors = []
+        warnings = []
+
+        if not isinstance(config_parameters, dict):
+            return [f'Config parameters must be an object, got {type(config_parameters).__name__}.'], warnings
+
+        for key in REQUIRED_PARAMETERS:
+            if key not in config_parameters or (key != 'SERVICES' and not is_non_empty(config_parameters[key])):
+                errors.append(f'Config parameters are missing {key}.')
+
+        for key in STRING_PARAMETERS:
+            if is_non_empty(config_parameters.get(key)) and not isinstance(config_parameters[key], str):
+                errors.append(f'{key} must be a string, got {config_parameters[key]!r}.')
+
+        #The inventory number is used to build the Telco hostname, so it may be a string or a whole number
+        inventory_number = config_parameters.get('INVENTORY_NUMBER')
+        if is_non_empty(inventory_number) and (isinstance(inventory_number, bool) or not isinstance(inventory_number, (str, int))):
+            errors.append(f'INVENTORY_NUMBER must be a string or whole number, got {inventory_number!r}.')
+
+        services = config_parameters.get('SERVICES')
+        if 'SERVICES' in config_parameters and (not isinstance(services, list) or len(services) == 0):
+            errors.append('SERVICES must be a non-empty list.')
+            return errors, warnings
+
+        if services is None:
+            return errors, warnings
+
+        #Map each LAN interface to the services using it, to find duplicates and uplink conflicts in one pass
+        lan_interface_to_services = {}
+        for index, service in enumerate(services):
+            lan_interface = validate_service(index, service, errors)
+            if lan_interface is not None:
+                lan_interface_to_services.setdefault(lan_interface, []).append(index + 1)
+
+        for lan_interface, service_numbers in lan_interface_to_services.items():
+            if len(service_numbers) > 1:
+                errors.append(f'LAN interface {lan_interface} is used by more than one service (services {", ".join(map(str, service_numbers))}).')
+
+        #If a known uplink was given, no service may use it as a LAN interface
+        uplink = config_parameters.get('UPLINK')
+        if uplink is not None:
+            if not isinstance(uplink, str) or uplink not in uplink_candidates:
+                errors.append(f'UPLINK {uplink!r} is not a valid uplink. The uplink must be {uplink_candidate_list}.')
+            elif uplink in lan_interface_to_services:
+                errors.append(f'LAN interface {uplink} is the uplink of the Telco (services {", ".join(map(str, lan_interface_to_services[uplink]))}).')
+            return errors, warnings
+
+        #Otherwise the uplink is not known until the CAM table is read from the Telco, so check every candidate
+        used_uplink_candidates = [candidate for candidate in uplink_candidates if candidate in lan_interface_to_services]
+        if len(used_uplink_candidates) == len(uplink_candidates):
+            errors.append(f'The services use every possible uplink ({", ".join(uplink_candidates)}) as a LAN interface. At least one of these must be left free for the uplink.')
+        else:
+            for candidate in used_uplink_candidates:
+                warnings.append(f'LAN interface {candidate} (services {", ".join(map(str, lan_interface_to_services[candidate]))}) can also be the uplink. '
+                                f'The run will fail after the core router is configured if the Telco uplink is {candidate}.')
+
+        return errors, warnings
+
+    return validate
+
+
+validate_config_parameters = compile_config_parameters_validator()
+
+
+def preflight_config_parameters(config_parameters):
+    """
+    Validates the config parameters before any network calls are made. If there are any errors, all of them
+    are printed and logged, and the script exits. Warnings are printed and logged, and the script continues.
+    """
+    errors, warnings = validate_config_parameters(config_parameters)
+
+    for warning in warnings:
+        print(f'Warning: {warning}\n')
+        logging.warning(f'Preflight validation warning: {warning}')
+
+    if errors:
+        print('The config parameters are not valid. Please correct the following and try again:')
+        for error in errors:
+            print(f'  - {error}')
+            logging.critical(f'Preflight validation error: {error}')
+        sys.exit(1)
+
+    logging.info('Preflight validation of config parameters passed')
+
+
+if __name__ == '__main__':
+    #Validate one or more CONFIG_PARAMETERS.json files, i.e. python validate_config_parameters.py files/*.json
+    invalid_file_count = 0
+    for path in sys.argv[1:]:
+        try:
+            with open(path, 'r') as config_parameters_file:
+                errors, warnings = validate_config_parameters(json.load(config_parameters_file))
+        except (OSError, ValueError) as e:
+            errors, warnings = [f'Could not read file: {e}'], []
+
+        if errors:
+            invalid_file_count += 1
+            print(f'{path}: INVALID')
+            for error in errors:
+                print(f'  - {error}')
+        else:
+            print(f'{path}: OK')
+
+        for warning in warnings:
+            print(f'  - Warning: {warning}')
+
+    sys.exit(1 if invalid_file_count else 0)